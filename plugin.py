@@ -12,9 +12,439 @@ from src.plugin_system import (
     EventType,
     MaiMessages,
     ToolParamType,
+    get_logger,
 )
-import aiohttp
-import json
+from collections import OrderedDict
+import asyncio
+import hashlib
+import httpx
+import orjson
+import sys
+import time
+from urllib.parse import urlparse
+
+logger = get_logger("cky-web-crawl")
+
+# 引擎模式 -> X-Engine 请求头取值
+_ENGINE_HEADERS = {"fast": "direct", "quality": "browser"}
+
+# 布尔配置项 -> (请求头, 启用时的取值)，搜索与内容提取共用
+_COMMON_BOOL_HEADERS = {
+    "remove_pictures": ("X-Retain-Images", "none"),
+    "move_links_to_end": ("X-With-Links-Summary", "true"),
+    "move_pics_to_end": ("X-With-Images-Summary", "true"),
+    "add_pic_alt": ("X-With-Generated-Alt", "true"),
+}
+
+# 内容提取使用的布尔配置项（包含共用项）
+_EXTRACT_BOOL_HEADERS = {
+    **_COMMON_BOOL_HEADERS,
+    "follow_redirect": ("X-Follow-Redirects", "true"),
+    "include_shadow_dom": ("X-Include-Shadow-DOM", "true"),
+    "include_iframes": ("X-Include-Iframes", "true"),
+    "use_readerlm_v2": ("X-Use-ReaderLM-V2", "true"),
+    "optimize_for_gpt_oss": ("X-Optimize-For-GPT-OSS", "true"),
+}
+
+
+def _build_engine_headers(
+    cfg: dict[str, Any], bool_headers: dict[str, tuple[str, str]]
+) -> dict[str, str]:
+    """根据配置节生成引擎模式、超时和布尔开关对应的请求头"""
+    headers: dict[str, str] = {}
+    engine = _ENGINE_HEADERS.get(cfg["engine_mode"])
+    if engine:
+        headers["X-Engine"] = engine
+    if cfg["timeout"] > 0:
+        headers["X-Timeout"] = str(cfg["timeout"])
+    for cfg_key, (header, value) in bool_headers.items():
+        if cfg[cfg_key]:
+            headers[header] = value
+    return headers
+
+
+# 所有工具调用共享的 HTTP 客户端，首次使用时创建，插件停止时关闭
+_client: httpx.AsyncClient | None = None
+
+
+async def _get_client() -> httpx.AsyncClient:
+    """获取共享的 HTTP 客户端，复用连接池以避免每次调用都重新握手"""
+    global _client
+    if _client is None or _client.is_closed:
+        # 启用 HTTP/2，同一 Jina 主机的并发请求复用单个连接
+        _client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=75,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+    return _client
+
+
+async def _close_client():
+    """关闭共享的 HTTP 客户端"""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+# 启动时预热连接的 Jina 服务地址
+_WARMUP_URLS = ("https://s.jina.ai/", "https://r.jina.ai/")
+
+
+async def _warmup_connections():
+    """向 Jina 服务发送 HEAD 请求，提前完成 TCP/TLS 握手并放入连接池"""
+    client = await _get_client()
+    results = await asyncio.gather(
+        *[client.head(url) for url in _WARMUP_URLS], return_exceptions=True
+    )
+    for url, result in zip(_WARMUP_URLS, results):
+        if isinstance(result, BaseException):
+            logger.debug(f"预热连接 {url} 失败: {result}")
+
+
+# 批量工具共享的并发信号量，按配置的并发上限惰性创建
+_batch_semaphore: asyncio.Semaphore | None = None
+_batch_semaphore_limit = 0
+
+
+def _get_batch_semaphore(limit: int) -> asyncio.Semaphore:
+    """获取批量工具共享的并发信号量，并发上限变化时重新创建"""
+    global _batch_semaphore, _batch_semaphore_limit
+    limit = max(1, limit)
+    if _batch_semaphore is None or _batch_semaphore_limit != limit:
+        _batch_semaphore = asyncio.Semaphore(limit)
+        _batch_semaphore_limit = limit
+    return _batch_semaphore
+
+
+def _split_items(value: Any) -> list[str]:
+    """将按行分隔的字符串或列表参数拆分为非空条目列表"""
+    if value is None:
+        return []
+    items = value if isinstance(value, list) else str(value).splitlines()
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+class _RateLimiter:
+    """令牌桶限速器，平均每秒最多放行 rate 个请求"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._capacity = max(1.0, rate)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# 按主机区分的限速器（s.jina.ai / r.jina.ai 各自独立计数）
+_rate_limiters: dict[str, _RateLimiter] = {}
+
+
+def _get_rate_limiter(endpoint: str, rate: float) -> _RateLimiter | None:
+    """获取端点所在主机的限速器，rate 不大于 0 时不限速"""
+    if rate <= 0:
+        return None
+    host = urlparse(endpoint).netloc
+    limiter = _rate_limiters.get(host)
+    if limiter is None or limiter.rate != rate:
+        limiter = _rate_limiters[host] = _RateLimiter(rate)
+    return limiter
+
+
+# 可重试错误的最大重试次数，以及单次等待的上限（秒）
+_MAX_RETRIES = 3
+_MAX_RETRY_DELAY = 60.0
+
+# 视为暂时性错误、可在插件内直接重试的状态码与异常
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_RETRY_EXCEPTIONS = (httpx.TransportError,)
+
+
+def _retry_delay(retry_after: str | None, fallback: float) -> float:
+    """解析 Retry-After 响应头（秒数），无法解析时使用退避时间"""
+    try:
+        delay = float(retry_after) if retry_after else fallback
+    except ValueError:
+        delay = fallback
+    return min(max(delay, 0.0), _MAX_RETRY_DELAY)
+
+
+def _format_batch_results(
+    field: str,
+    items: list[str],
+    results: list[Any],
+    error_prefix: str,
+    max_bytes: int,
+) -> str:
+    """将批量请求结果整理为 JSON 数组
+
+    max_bytes 大于 0 时，成功内容的总字节数超出该值后，后续内容将被截断
+    """
+    remaining = max_bytes
+    content = []
+    for item, result in zip(items, results):
+        if isinstance(result, BaseException):
+            content.append(
+                {
+                    field: item,
+                    "success": False,
+                    "content": f"{error_prefix}，{_describe_error(result)}",
+                }
+            )
+            continue
+        if max_bytes > 0:
+            encoded = result.encode("utf-8")
+            if len(encoded) > remaining:
+                kept = encoded[:remaining].decode("utf-8", errors="ignore")
+                result = f"{kept}\n[truncated]" if kept else "[truncated]"
+            remaining = max(0, remaining - len(encoded))
+        content.append({field: item, "success": True, "content": result})
+    return orjson.dumps(content).decode("utf-8")
+
+
+# 条件请求缓存：请求指纹 -> (ETag, Last-Modified, 响应内容)
+# 同时限制条目数和响应内容占用的总内存，单个过大的响应不缓存
+_RESPONSE_CACHE_SIZE = 512
+_RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+_RESPONSE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024
+_response_cache: "OrderedDict[str, tuple[str | None, str | None, str]]" = OrderedDict()
+_response_cache_bytes = 0
+
+
+def _cache_response(key: str, etag: str | None, last_modified: str | None, text: str):
+    """写入条件请求缓存，超出条目数或总内存上限时淘汰最久未使用的条目"""
+    global _response_cache_bytes
+    old = _response_cache.pop(key, None)
+    if old is not None:
+        _response_cache_bytes -= sys.getsizeof(old[2])
+    size = sys.getsizeof(text)
+    if size > _RESPONSE_CACHE_MAX_ENTRY_BYTES:
+        return
+    _response_cache[key] = (etag, last_modified, text)
+    _response_cache_bytes += size
+    while (
+        len(_response_cache) > _RESPONSE_CACHE_SIZE
+        or _response_cache_bytes > _RESPONSE_CACHE_MAX_BYTES
+    ):
+        _, (_, _, evicted) = _response_cache.popitem(last=False)
+        _response_cache_bytes -= sys.getsizeof(evicted)
+
+
+def _request_key(endpoint: str, headers: dict[str, str], body: dict[str, Any]) -> str:
+    """根据请求端点、请求头（不含凭据）和请求体计算缓存键"""
+    fingerprint = orjson.dumps(
+        [
+            endpoint,
+            {k: v for k, v in headers.items() if k != "Authorization"},
+            body,
+        ],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha1(fingerprint).hexdigest()
+
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+async def _read_body(response: httpx.Response, max_bytes: int = 0) -> tuple[bytearray, bool]:
+    """分块读取响应内容，避免整体读取时的重复内存分配
+
+    max_bytes 大于 0 时，读取到该大小后停止下载，返回的第二项表示内容是否被截断
+    """
+    buf = bytearray()
+    truncated = False
+    async for chunk in response.aiter_bytes(_READ_CHUNK_SIZE):
+        buf.extend(chunk)
+        if 0 < max_bytes < len(buf):
+            truncated = True
+            break
+    if truncated:
+        # 提前关闭响应，不再下载剩余内容
+        await response.aclose()
+        del buf[max_bytes:]
+    return buf, truncated
+
+
+async def _read_success(
+    response: httpx.Response, max_bytes: int = 0
+) -> tuple[bytearray, bool, str, str | None, str | None]:
+    """读取成功响应的内容，返回 (内容, 是否截断, 编码, ETag, Last-Modified)"""
+    buf, truncated = await _read_body(response, max_bytes)
+    return (
+        buf,
+        truncated,
+        response.charset_encoding or "utf-8",
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+    )
+
+
+def _decode_body(buf: bytearray, encoding: str, truncated: bool) -> str:
+    """解码响应内容，被截断时在末尾标注"""
+    text = buf.decode(encoding, errors="replace")
+    return text + "\n[truncated]" if truncated else text
+
+
+def _describe_error(e: BaseException) -> str:
+    """将请求异常转换为便于 LLM 理解的错误说明"""
+    if not isinstance(e, httpx.HTTPStatusError):
+        return str(e) or type(e).__name__
+    response = e.response
+    description = f"状态码: {response.status_code} {response.reason_phrase}"
+    try:
+        detail = orjson.loads(response.content)
+        message = detail.get("readableMessage") or detail.get("message")
+    except (httpx.ResponseNotRead, orjson.JSONDecodeError, AttributeError):
+        message = None
+    return f"{description}，{message}" if message else description
+
+
+# 进行中的请求，相同请求的并发调用共享同一个后台任务
+_inflight: dict[str, asyncio.Task] = {}
+
+# 失败请求的短期缓存：请求指纹 -> (过期时间, 错误说明)，避免失败请求被循环重试
+_NEGATIVE_CACHE_TTL = 30
+_NEGATIVE_CACHE_SIZE = 512
+_negative_cache: dict[str, tuple[float, str]] = {}
+
+
+def _on_fetch_done(key: str, task: asyncio.Task):
+    """请求任务结束后移出进行中列表，失败时写入失败缓存"""
+    _inflight.pop(key, None)
+    if task.cancelled():
+        return
+    e = task.exception()
+    if not isinstance(e, Exception):
+        return
+    # 写入前清理已过期的条目，并按插入顺序淘汰超出容量的旧条目
+    now = time.monotonic()
+    for expired in [k for k, (expires_at, _) in _negative_cache.items() if expires_at <= now]:
+        del _negative_cache[expired]
+    while len(_negative_cache) >= _NEGATIVE_CACHE_SIZE:
+        del _negative_cache[next(iter(_negative_cache))]
+    # 只保存错误说明，不持有异常对象及其引用的响应和调用栈
+    _negative_cache[key] = (now + _NEGATIVE_CACHE_TTL, _describe_error(e))
+
+
+async def _post_jina(
+    endpoint: str,
+    headers: dict[str, str],
+    body: dict[str, Any],
+    provider: dict[str, Any],
+    max_bytes: int = 0,
+) -> str:
+    """向 Jina 发送请求，合并相同的并发请求，并在短时间内直接复用失败结果
+
+    实际请求在独立任务中执行，单个调用方被取消不会影响其他等待同一结果的调用方
+    """
+    key = _request_key(endpoint, headers, body)
+
+    failure = _negative_cache.get(key)
+    if failure is not None:
+        if failure[0] > time.monotonic():
+            raise Exception(failure[1])
+        del _negative_cache[key]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _fetch_jina(key, endpoint, headers, body, provider, max_bytes)
+        )
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _on_fetch_done(key, t))
+    return await asyncio.shield(task)
+
+
+async def _fetch_jina(
+    key: str,
+    endpoint: str,
+    headers: dict[str, str],
+    body: dict[str, Any],
+    provider: dict[str, Any],
+    max_bytes: int = 0,
+) -> str:
+    """实际发送请求，命中缓存时附带条件请求头，收到 304 则直接返回缓存内容
+
+    请求按主机限速；遇到限流、服务端错误、连接中断或超时时，
+    按 Retry-After 或指数退避等待后重试，其他错误状态码直接抛出 httpx.HTTPStatusError
+    """
+    # 请求体只序列化一次，重试时直接复用
+    payload = orjson.dumps(body)
+    headers = {**headers, "Content-Type": "application/json"}
+    cached = _response_cache.get(key)
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    client = await _get_client()
+    limiter = _get_rate_limiter(endpoint, provider.get("max_rps", 3.0))
+    backoff = provider.get("retry_backoff_factor", 1.0)
+    for attempt in range(_MAX_RETRIES + 1):
+        if limiter is not None:
+            await limiter.acquire()
+        success = None
+        try:
+            async with client.stream(
+                "POST", endpoint, headers=headers, content=payload
+            ) as response:
+                logger.debug(
+                    f"{endpoint} 响应状态: {response.status_code}，"
+                    f"协议: {response.http_version}，"
+                    f"内容编码: {response.headers.get('Content-Encoding', 'identity')}"
+                )
+                if response.status_code in _RETRY_STATUSES and attempt < _MAX_RETRIES:
+                    delay = _retry_delay(
+                        response.headers.get("Retry-After"), backoff * 2**attempt
+                    )
+                    reason = f"状态码: {response.status_code}"
+                elif response.status_code == 304 and cached is not None:
+                    _response_cache.move_to_end(key)
+                    return cached[2]
+                elif response.is_success:
+                    success = await _read_success(response, max_bytes)
+                else:
+                    # 错误响应体很小，读取后供 _describe_error 提取 Jina 的错误说明
+                    await response.aread()
+                    response.raise_for_status()
+        except _RETRY_EXCEPTIONS as e:
+            if attempt >= _MAX_RETRIES:
+                raise
+            delay = _retry_delay(None, backoff * 2**attempt)
+            reason = str(e) or type(e).__name__
+
+        if success is not None:
+            # 已退出响应上下文，连接归还连接池后再解码
+            buf, truncated, encoding, etag, last_modified = success
+            text = _decode_body(buf, encoding, truncated)
+            if etag or last_modified:
+                _cache_response(key, etag, last_modified, text)
+            return text
+
+        logger.warning(f"{endpoint} 请求失败（{reason}），{delay:.1f} 秒后重试")
+        await asyncio.sleep(delay)
+
+    raise Exception(f"重试 {_MAX_RETRIES} 次后请求仍然失败")
 
 
 class WebSearchTool(BaseTool):
@@ -33,48 +463,41 @@ class WebSearchTool(BaseTool):
     ]
     available_for_llm = True
 
+    # 由插件配置预先生成的请求头/请求体模板，配置不变时各次调用共用
+    _static_headers: dict[str, str] | None = None
+    _static_body: dict[str, Any] | None = None
+
+    @classmethod
+    def prepare_templates(cls, config: dict[str, Any]):
+        """根据插件配置生成搜索请求的请求头和请求体模板"""
+        cfg = config["search"]
+        body: dict[str, Any] = {}
+
+        if cfg["search_nation"] != "not-specified":
+            body["gl"] = cfg["search_nation"]
+        if cfg["search_language"] != "not-specified":
+            body["hl"] = cfg["search_language"]
+
+        if cfg["crawl_details"]:
+            headers = _build_engine_headers(cfg, _COMMON_BOOL_HEADERS)
+        else:
+            headers = {"X-Respond-With": "no-content"}
+
+        cls._static_headers = headers
+        cls._static_body = body
+
     async def search(self, kw: str):
         endpoint = "https://s.jina.ai/"
+        if self._static_headers is None or self._static_body is None:
+            self.prepare_templates(self.plugin_config)
+        provider = self.plugin_config["provider"]
         headers = {
-            "Authorization": f"Bearer {self.plugin_config['provider']['jina_api_key']}",
-            "Content-Type": "application/json",
-        }
-        body = {
-            "q": kw,
+            "Authorization": f"Bearer {provider['jina_api_key']}",
+            **self._static_headers,  # type: ignore
         }
+        body = {"q": kw, **self._static_body}  # type: ignore
 
-        if self.plugin_config["search"]["search_nation"] != "not-specified":
-            body["gl"] = self.plugin_config["search"]["search_nation"]
-        if self.plugin_config["search"]["search_language"] != "not-specified":
-            body["hl"] = self.plugin_config["search"]["search_language"]
-
-        if self.plugin_config["search"]["crawl_details"]:
-            match self.plugin_config["search"]["engine_mode"]:
-                case "fast":
-                    headers["X-Engine"] = "direct"
-                case "quality":
-                    headers["X-Engine"] = "browser"
-            if self.plugin_config["search"]["timeout"] > 0:
-                headers["X-Timeout"] = str(self.plugin_config["search"]["timeout"])
-            if self.plugin_config["search"]["remove_pictures"]:
-                headers["X-Retain-Images"] = "none"
-            if self.plugin_config["search"]["move_links_to_end"]:
-                headers["X-With-Links-Summary"] = "true"        
-            if self.plugin_config["search"]["move_pics_to_end"]:
-                headers["X-With-Images-Summary"] = "true"
-            if self.plugin_config["search"]["add_pic_alt"]:
-                headers["X-With-Generated-Alt"] = "true"    
-        else:
-            headers["X-Respond-With"] = "no-content"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                endpoint, headers=headers, data=json.dumps(body)
-            ) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    raise Exception(f"搜索请求失败，状态码: {response.status}")
+        return await _post_jina(endpoint, headers, body, provider)
 
     async def execute(self, function_args: dict[str, Any]) -> dict[str, Any]:
         """执行从网络上搜索某关键字的相关网页
@@ -91,7 +514,7 @@ class WebSearchTool(BaseTool):
             search_results = await self.search(keywords)
             return {"name": self.name, "content": search_results}
         except Exception as e:
-            return {"name": self.name, "content": f"搜索失败: {str(e)}"}
+            return {"name": self.name, "content": f"搜索失败，{_describe_error(e)}"}
 
 class UrlCrawlTool(BaseTool):
     """从URL提取内容的工具"""
@@ -109,56 +532,41 @@ class UrlCrawlTool(BaseTool):
     ]
     available_for_llm = True
 
+    # 由插件配置预先生成的请求头模板，配置不变时各次调用共用
+    _static_headers: dict[str, str] | None = None
+
+    @classmethod
+    def prepare_templates(cls, config: dict[str, Any]):
+        """根据插件配置生成内容提取请求的请求头模板"""
+        cfg = config["extract"]
+        headers = _build_engine_headers(cfg, _EXTRACT_BOOL_HEADERS)
+        if cfg["use_custom_prehandler_scripts"]:
+            headers["X-Use-Custom-Prehandler-Scripts"] = "true"
+            if cfg["custom_prehandler_scripts_list"]:
+                headers["X-Custom-Prehandler-Scripts-List"] = ",".join(
+                    cfg["custom_prehandler_scripts_list"]
+                )
+
+        cls._static_headers = headers
+
     async def crawl(self, url: str):
         endpoint = "https://r.jina.ai/"
+        if self._static_headers is None:
+            self.prepare_templates(self.plugin_config)
+        provider = self.plugin_config["provider"]
         headers = {
-            "Authorization": f"Bearer {self.plugin_config['provider']['jina_api_key']}",
-            "Content-Type": "application/json",
-        }
-        body = {
-            "url": url,
+            "Authorization": f"Bearer {provider['jina_api_key']}",
+            **self._static_headers,  # type: ignore
         }
+        body = {"url": url}
 
-        match self.plugin_config["extract"]["engine_mode"]:
-            case "fast":
-                headers["X-Engine"] = "direct"
-            case "quality":
-                headers["X-Engine"] = "browser"
-        if self.plugin_config["extract"]["timeout"] > 0:
-            headers["X-Timeout"] = str(self.plugin_config["extract"]["timeout"])
-        if self.plugin_config["extract"]["follow_redirect"]:
-            headers["X-Follow-Redirects"] = "true"
-        if self.plugin_config["extract"]["use_custom_prehandler_scripts"]:
-            headers["X-Use-Custom-Prehandler-Scripts"] = "true"
-            if self.plugin_config["extract"]["custom_prehandler_scripts_list"]:
-                headers["X-Custom-Prehandler-Scripts-List"] = ",".join(
-                    self.plugin_config["extract"]["custom_prehandler_scripts_list"]
-                )
-        if self.plugin_config["extract"]["include_shadow_dom"]:
-            headers["X-Include-Shadow-DOM"] = "true"
-        if self.plugin_config["extract"]["include_iframes"]:
-            headers["X-Include-Iframes"] = "true"
-        if self.plugin_config["extract"]["remove_pictures"]:
-            headers["X-Retain-Images"] = "none"
-        if self.plugin_config["extract"]["use_readerlm_v2"]:
-            headers["X-Use-ReaderLM-V2"] = "true"
-        if self.plugin_config["extract"]["move_links_to_end"]:
-            headers["X-With-Links-Summary"] = "true"        
-        if self.plugin_config["extract"]["move_pics_to_end"]:
-            headers["X-With-Images-Summary"] = "true"
-        if self.plugin_config["extract"]["add_pic_alt"]:
-            headers["X-With-Generated-Alt"] = "true"    
-        if self.plugin_config["extract"]["optimize_for_gpt_oss"]:
-            headers["X-Optimize-For-GPT-OSS"] = "true"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                endpoint, headers=headers, data=json.dumps(body)
-            ) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    raise Exception(f"内容提取请求失败，状态码: {response.status}")
+        return await _post_jina(
+            endpoint,
+            headers,
+            body,
+            provider,
+            self.plugin_config["extract"].get("max_response_bytes", 524288),
+        )
                 
     async def execute(self, function_args: dict[str, Any]) -> dict[str, Any]:
         """执行从指定URL提取网页内容
@@ -175,7 +583,149 @@ class UrlCrawlTool(BaseTool):
             crawl_result = await self.crawl(url)
             return {"name": self.name, "content": crawl_result}
         except Exception as e:
-            return {"name": self.name, "content": f"内容提取失败: {str(e)}"}
+            return {"name": self.name, "content": f"内容提取失败，{_describe_error(e)}"}
+
+class ConnectionWarmupHandler(BaseEventHandler):
+    """启动时预热 Jina 连接的事件处理器
+
+    空闲连接在 keepalive_expiry（75 秒）后会被关闭，预热只对启动后不久的工具调用有效
+    """
+
+    event_type = EventType.ON_START
+    handler_name = "cky_web_crawl_connection_warmup"
+    handler_description = "预先建立到 Jina 服务的连接，减少首次调用的握手延迟"
+    weight = 0
+    intercept_message = False
+
+    async def execute(self, message: MaiMessages | None) -> Tuple[bool, bool, str | None]:
+        try:
+            await _warmup_connections()
+        except Exception as e:
+            logger.debug(f"预热连接失败: {e}")
+        return True, True, None
+
+class ClientCleanupHandler(BaseEventHandler):
+    """插件停止时关闭共享 HTTP 客户端的事件处理器"""
+
+    event_type = EventType.ON_STOP
+    handler_name = "cky_web_crawl_client_cleanup"
+    handler_description = "关闭 WebCrawl 插件共享的 HTTP 客户端"
+    weight = 0
+    intercept_message = False
+
+    async def execute(self, message: MaiMessages | None) -> Tuple[bool, bool, str | None]:
+        await _close_client()
+        return True, True, None
+
+class WebSearchManyTool(WebSearchTool):
+    """并发搜索多组关键字的工具"""
+
+    name = "search_web_many"
+    description = "使用工具 同时从网络上搜索多组关键字的相关网页"
+    parameters = [
+        (
+            "queries",
+            ToolParamType.STRING,
+            "多组搜索关键字，每行一组，每组的写法与单次搜索相同",
+            True,
+            None,
+        ),
+    ]
+    available_for_llm = True
+
+    async def _search_one(self, kw: str, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            return await self.search(kw)
+
+    async def execute(self, function_args: dict[str, Any]) -> dict[str, Any]:
+        """执行并发搜索多组关键字
+
+        Args:
+            function_args: 工具参数
+
+        Returns:
+            dict: 工具执行结果，内容为每组关键字搜索结果的 JSON 数组
+        """
+        try:
+            queries = _split_items(function_args.get("queries"))
+            provider = self.plugin_config["provider"]
+            max_batch_size = provider.get("max_batch_size", 10)
+            if not queries:
+                raise ValueError("未提供任何搜索关键字")
+            if len(queries) > max_batch_size:
+                raise ValueError(
+                    f"一次最多搜索 {max_batch_size} 组关键字，收到 {len(queries)} 组，请分批调用"
+                )
+
+            semaphore = _get_batch_semaphore(provider.get("max_concurrency", 5))
+            results = await asyncio.gather(
+                *[self._search_one(kw, semaphore) for kw in queries], return_exceptions=True
+            )
+            content = _format_batch_results(
+                "keywords",
+                queries,
+                results,
+                "搜索失败",
+                provider.get("max_batch_response_bytes", 1048576),
+            )
+            return {"name": self.name, "content": content}
+        except Exception as e:
+            return {"name": self.name, "content": f"搜索失败，{_describe_error(e)}"}
+
+class UrlCrawlManyTool(UrlCrawlTool):
+    """并发从多个URL提取内容的工具"""
+
+    name = "crawl_urls"
+    description = "使用工具 同时从多个URL提取网页内容"
+    parameters = [
+        (
+            "urls",
+            ToolParamType.STRING,
+            "要提取内容的网页URL列表，每行一个，必须以http://或https://开头",
+            True,
+            None,
+        ),
+    ]
+    available_for_llm = True
+
+    async def _crawl_one(self, url: str, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            return await self.crawl(url)
+
+    async def execute(self, function_args: dict[str, Any]) -> dict[str, Any]:
+        """执行并发从多个URL提取网页内容
+
+        Args:
+            function_args: 工具参数
+
+        Returns:
+            dict: 工具执行结果，内容为每个 URL 提取结果的 JSON 数组
+        """
+        try:
+            urls = _split_items(function_args.get("urls"))
+            provider = self.plugin_config["provider"]
+            max_batch_size = provider.get("max_batch_size", 10)
+            if not urls:
+                raise ValueError("未提供任何URL")
+            if len(urls) > max_batch_size:
+                raise ValueError(
+                    f"一次最多提取 {max_batch_size} 个URL，收到 {len(urls)} 个，请分批调用"
+                )
+
+            semaphore = _get_batch_semaphore(provider.get("max_concurrency", 5))
+            results = await asyncio.gather(
+                *[self._crawl_one(url, semaphore) for url in urls], return_exceptions=True
+            )
+            content = _format_batch_results(
+                "url",
+                urls,
+                results,
+                "内容提取失败",
+                provider.get("max_batch_response_bytes", 1048576),
+            )
+            return {"name": self.name, "content": content}
+        except Exception as e:
+            return {"name": self.name, "content": f"内容提取失败，{_describe_error(e)}"}
 
 # ===== 插件注册 =====
 
@@ -188,7 +738,7 @@ class WebCrawlPlugin(BasePlugin):
     plugin_name: str = "cky-web-crawl"  # 内部标识符
     enable_plugin: bool = True
     dependencies: List[str] = []  # 插件依赖列表
-    python_dependencies: List[str] = []  # Python包依赖列表
+    python_dependencies: List[str] = ["httpx[http2]", "orjson"]  # Python包依赖列表
     config_file_name: str = "config.toml"  # 配置文件名
 
     # 配置节描述
@@ -205,7 +755,10 @@ class WebCrawlPlugin(BasePlugin):
             "name": ConfigField(
                 type=str, default="cky-web-crawl", description="插件名称"
             ),
-            "version": ConfigField(type=str, default="1.0.0", description="插件版本"),
+            "version": ConfigField(type=str, default="1.1.0", description="插件版本"),
+            "config_version": ConfigField(
+                type=str, default="1.1.0", description="配置文件版本"
+            ),
             "enabled": ConfigField(
                 type=bool, default=False, description="是否启用插件"
             ),
@@ -217,6 +770,27 @@ class WebCrawlPlugin(BasePlugin):
             "jina_api_key": ConfigField(
                 type=str, default="", description="Jina API Key", required=True
             ),
+            "max_concurrency": ConfigField(
+                type=int, default=5, description="批量搜索/提取时的最大并发请求数"
+            ),
+            "max_batch_size": ConfigField(
+                type=int, default=10, description="批量搜索/提取单次调用最多包含的条目数"
+            ),
+            "max_batch_response_bytes": ConfigField(
+                type=int,
+                default=1048576,
+                description="批量搜索/提取单次调用返回内容的总字节数上限，超出部分将被截断，0 表示不限制",
+            ),
+            "max_rps": ConfigField(
+                type=float,
+                default=3.0,
+                description="每个 Jina 服务每秒最多发送的请求数，0 表示不限速",
+            ),
+            "retry_backoff_factor": ConfigField(
+                type=float,
+                default=1.0,
+                description="请求失败重试时的指数退避基数（秒），限流时优先使用 Retry-After",
+            ),
         },
         "search": {
             "search_nation": ConfigField(
@@ -324,11 +898,23 @@ class WebCrawlPlugin(BasePlugin):
                 description="引擎模式 (平衡/快速/质量)",
                 choices=["default", "fast", "quality"],
             ),
+            "max_response_bytes": ConfigField(
+                type=int,
+                default=524288,
+                description="提取内容的最大字节数，超出部分将被截断，0 表示不限制",
+            ),
         },
     }
 
     def get_plugin_components(self) -> List[Tuple[ComponentInfo, Type]]:
+        # 配置在插件加载后不再变化，预先生成各工具的请求模板
+        WebSearchTool.prepare_templates(self.config)
+        UrlCrawlTool.prepare_templates(self.config)
         return [
             (WebSearchTool.get_tool_info(), WebSearchTool), 
             (UrlCrawlTool.get_tool_info(), UrlCrawlTool),
+            (WebSearchManyTool.get_tool_info(), WebSearchManyTool),
+            (UrlCrawlManyTool.get_tool_info(), UrlCrawlManyTool),
+            (ConnectionWarmupHandler.get_handler_info(), ConnectionWarmupHandler),
+            (ClientCleanupHandler.get_handler_info(), ClientCleanupHandler),
         ]